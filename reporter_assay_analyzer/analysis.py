@@ -1,9 +1,35 @@
 from __future__ import annotations
 
+import warnings
+from typing import Iterable, Iterator
+
+import numpy as np
 import pandas as pd
 
 CONTROL_SAMPLE = "siNT"
 
+# optional per-plate normalizations -> label used in the output column names
+NORMALIZATIONS = {
+    "percent_of_control": "% of control",
+    "zscore": "z-score",
+    "robust_zscore": "robust z-score",
+    "bscore": "B-score",
+}
+
+# blanks and controls are shared within one plate read at one timepoint
+PLATE_KEYS = ["plate", "time_h"]
+
+_MAD_SCALE = 1.4826  # makes MAD a consistent estimator of the std for normal data
+_MEDIAN_POLISH_ITERS = 10
+
+# analyze_stream: rows prepared in one go (only cut between plate+timepoints)
+# and partial results kept before they are reduced into one
+_STREAM_BATCH_ROWS = 100_000
+_STREAM_MAX_PARTIALS = 64
+
+# bootstrap draws held at once (replicates x groups x wells), see _bootstrap_fold_ci
+_BOOT_BATCH_CELLS = 4_000_000
+
 
 def _standardize_condition(series: pd.Series) -> pd.Series:
     # turn things like "0 mM", "0MM", "2mM " into exactly "0mM"/"2mM"
@@ -26,32 +52,220 @@ def _standardize_condition(series: pd.Series) -> pd.Series:
     return s
 
 
-def analyze(tidy: pd.DataFrame, mapping: pd.DataFrame) -> pd.DataFrame:
+def _control_set(control: str | Iterable[str]) -> set[str]:
+    if isinstance(control, str):
+        return {control.strip()}
+    names = {str(c).strip() for c in control}
+    if not names:
+        raise ValueError("At least one control sample name is required")
+    return names
+
+
+def _well_scores(df: pd.DataFrame, normalization: str) -> pd.Series:
+    """
+    Per-well plate scores for sample wells, computed for all plates at once.
+
+    Every statistic is grouped by (plate, time_h), so each plate read is
+    normalized against its own distribution.
+    """
+    value = df["value"].astype(float)
+    by_plate = [df[k] for k in PLATE_KEYS]
+
+    if normalization == "zscore":
+        grouped = value.groupby(by_plate)
+        return (value - grouped.transform("mean")) / grouped.transform("std")
+
+    if normalization == "robust_zscore":
+        resid = value - value.groupby(by_plate).transform("median")
+    else:  # bscore: remove row/column effects with Tukey's median polish
+        row = df["well"].str[0]
+        col = df["well"].str[1:]
+        resid = value
+        for _ in range(_MEDIAN_POLISH_ITERS):
+            resid = resid - resid.groupby(by_plate + [row]).transform("median")
+            resid = resid - resid.groupby(by_plate + [col]).transform("median")
+        resid = resid - resid.groupby(by_plate).transform("median")
+
+    mad = resid.abs().groupby(by_plate).transform("median") * _MAD_SCALE
+    return resid / mad
+
+
+def analyze(
+    tidy: pd.DataFrame,
+    mapping: pd.DataFrame,
+    control: str | Iterable[str] = CONTROL_SAMPLE,
+    normalization: str | None = None,
+    ratio: tuple[str, str] | None = None,
+    bootstrap: int = 0,
+    ci: float = 0.95,
+    seed: int | None = 0,
+) -> pd.DataFrame:
     """
     Inputs:
-      tidy: time_h, well, value
-      mapping: well, sample, condition, well_type
+      tidy: time_h, well, value (optional: plate, readout)
+      mapping: well, sample, condition, well_type (optional: plate, for
+        layouts that differ between plates)
+      control: control sample name, or several names whose wells are pooled
+        into one control per plate+time+condition
+      normalization: optional extra plate normalization, one of
+        NORMALIZATIONS ("percent_of_control", "zscore", "robust_zscore",
+        "bscore")
+      ratio: optional (reporter, normalizer) readout names for dual-reporter
+        data; default is the single-readout analysis
+      bootstrap: number of bootstrap resamples for fold confidence intervals
+        (0 = off); ci is the interval level, seed seeds the NumPy generator
 
     Behavior:
-      - blanks are shared (one blank per timepoint)
-      - blank = mean of all wells with well_type='blank' per timepoint
-      - average replicates per sample+condition+time
+      - blanks are shared (one blank per plate+timepoint)
+      - blank = mean of all wells with well_type='blank' per plate+timepoint
+      - average replicates per plate+sample+condition+time
       - subtract blank
-      - fold change to siNT per timepoint+condition:
-          (sample minus blank) / (siNT minus blank)
+      - fold change to control per plate+timepoint+condition:
+          (sample minus blank) / (control minus blank)
+      - z-score / robust z-score / B-score are computed per well over the
+        sample wells of each plate+timepoint, then averaged like the reads
+      - ratio mode: each readout is blank-subtracted per well first, then
+        value = reporter / normalizer per well; blank wells become 0, so the
+        blank columns are 0 and 'average' / 'minus blank' hold mean ratios
+      - bootstrap: replicate wells and blank wells are resampled with
+        replacement within each group and the fold is recomputed per
+        resample; the CI is the percentile interval
 
     Output columns:
-      time_h, sample,
+      [plate,] time_h, sample,
       0mM average, 2mM average,
       blank, 0mM blank, 2mM blank,
       0mM minus blank, 2mM minus blank,
-      0mM (fold to siNT), 2mM (fold to siNT)
+      0mM (fold to siNT), 2mM (fold to siNT),
+      [0mM (<normalization>), 2mM (<normalization>)]
+      [0mM (fold to siNT) CI low, 0mM (fold to siNT) CI high, same for 2mM]
+
+    The fold columns keep their 'siNT' name whatever the control is, so
+    downstream plotting works unchanged. 'plate' is only included when the
+    tidy input has a plate column.
+    """
+    _check_options(mapping, normalization)
+    if bootstrap < 0 or not 0 < ci < 1:
+        raise ValueError("bootstrap must be >= 0 and ci between 0 and 1")
+    controls = _control_set(control)
+    _check_readouts(_readouts(tidy), ratio)
+    df = _prepare(tidy, mapping, ratio)
+    parts = _partial_sums(df, controls, normalization)
+    fold_ci = _bootstrap_fold_ci(df, controls, bootstrap, ci, seed) if bootstrap else None
+    return _finish(parts, normalization, has_plate="plate" in tidy.columns, fold_ci=fold_ci)
+
+
+def analyze_stream(
+    blocks: Iterable[pd.DataFrame],
+    mapping: pd.DataFrame,
+    control: str | Iterable[str] = CONTROL_SAMPLE,
+    normalization: str | None = None,
+    ratio: tuple[str, str] | None = None,
+) -> pd.DataFrame:
+    """
+    Same result as analyze(), but consumes the tidy data one block at a time
+    (e.g. one plate+timepoint from iter_stacked_blocks) so memory stays
+    bounded by the block size, not the archive size.
+
+    Only per-group sums and counts are carried between blocks, so blanks,
+    replicate means and folds are exact even if a group spans several
+    blocks. Consecutive blocks are prepared together in batches of about
+    _STREAM_BATCH_ROWS rows, cut only where the plate+timepoint changes (so
+    e.g. both readouts of a dual-reporter plate stay together); z-score /
+    B-score and ratio mode need the whole plate+timepoint in consecutive
+    blocks. Batch partials are summed once every _STREAM_MAX_PARTIALS
+    batches and at the end.
+    """
+    _check_options(mapping, normalization)
+    controls = _control_set(control)
+
+    partials: list[dict[str, pd.DataFrame]] = []
+    has_plate = False
+    readouts: set[str] = set()
+    for batch in _plate_batches(blocks, _STREAM_BATCH_ROWS):
+        has_plate = has_plate or "plate" in batch.columns
+        readouts |= _readouts(batch)
+        partials.append(_partial_sums(_prepare(batch, mapping, ratio), controls, normalization))
+        if len(partials) >= _STREAM_MAX_PARTIALS:
+            partials = [_reduce_partials(partials)]
+
+    if not partials:
+        raise ValueError("No plate blocks to analyze")
+    # checked over all blocks, like analyze(): a block lacking one readout
+    # yields NaN ratios rather than failing the run
+    _check_readouts(readouts, ratio)
+    return _finish(_reduce_partials(partials), normalization, has_plate=has_plate)
+
+
+def _readouts(tidy: pd.DataFrame) -> set[str]:
+    return set(tidy["readout"].unique()) if "readout" in tidy.columns else set()
+
+
+def _concat_blocks(blocks: list[pd.DataFrame]) -> pd.DataFrame:
+    out = pd.concat(blocks, ignore_index=True)
+    # blocks without a plate / readout title mix with ones that have it
+    for col in ("plate", "readout"):
+        if col in out.columns:
+            out[col] = out[col].fillna("")
+    return out
+
+
+def _plate_batches(blocks: Iterable[pd.DataFrame], max_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Concatenate consecutive blocks into batches of about max_rows rows,
+    only cutting where the covered plate+timepoint(s) change.
     """
+    pending: list[pd.DataFrame] = []
+    pending_rows = 0
+    pending_key = None
+    for block in blocks:
+        if block.empty:
+            continue
+        keys = [k for k in PLATE_KEYS if k in block.columns]
+        key = frozenset(zip(*(block[k].tolist() for k in keys)))
+        if pending and key != pending_key and pending_rows >= max_rows:
+            yield _concat_blocks(pending)
+            pending, pending_rows = [], 0
+        pending.append(block)
+        pending_rows += len(block)
+        pending_key = key
+    if pending:
+        yield _concat_blocks(pending)
+
+
+def _check_options(mapping: pd.DataFrame, normalization: str | None) -> None:
     required = {"well", "sample", "condition", "well_type"}
     if not required.issubset(mapping.columns):
         raise ValueError(f"Mapping file must include columns: {sorted(required)}")
+    if normalization is not None and normalization not in NORMALIZATIONS:
+        raise ValueError(
+            f"normalization must be one of {sorted(NORMALIZATIONS)}, got {normalization!r}"
+        )
+
 
-    df = tidy.merge(mapping, on="well", how="left")
+def _prepare(
+    tidy: pd.DataFrame, mapping: pd.DataFrame, ratio: tuple[str, str] | None = None
+) -> pd.DataFrame:
+    """
+    Attach the mapping to tidy reads; plate is '' when the data has none.
+    Multi-readout data is reduced to one value per well (see _readout_ratio).
+    """
+    has_plate = "plate" in tidy.columns
+    tidy = tidy.copy()
+    if has_plate:
+        tidy["plate"] = tidy["plate"].astype(str).str.strip()
+    else:
+        tidy["plate"] = ""
+
+    if "plate" in mapping.columns:
+        # per-plate layouts
+        if not has_plate:
+            raise ValueError("Mapping has a 'plate' column but the plate data does not")
+        mapping = mapping.copy()
+        mapping["plate"] = mapping["plate"].astype(str).str.strip()
+        df = tidy.merge(mapping, on=["plate", "well"], how="left")
+    else:
+        df = tidy.merge(mapping, on="well", how="left")
 
     # Ensure every well is mapped (no NaNs)
     if df["sample"].isna().any():
@@ -63,62 +277,329 @@ def analyze(tidy: pd.DataFrame, mapping: pd.DataFrame) -> pd.DataFrame:
     df["sample"] = df["sample"].astype(str).str.strip()
     df["condition"] = _standardize_condition(df["condition"])
 
-    blanks_df = df[df["well_type"] == "blank"].copy()
-    samples_df = df[df["well_type"] == "sample"].copy()
+    if ratio is not None:
+        return _readout_ratio(df, ratio)
+    if "readout" in df.columns:
+        df = df.drop(columns="readout")  # single readout, see _check_readouts
+    return df
 
-    # 1) shared blank per timepoint
-    blanks = (
-        blanks_df.groupby("time_h", dropna=False)
-        .agg(blank=("value", "mean"))
-        .reset_index()
-    )
 
-    # 2) replicate mean per time/sample/condition
-    samples = (
-        samples_df.groupby(["time_h", "sample", "condition"], dropna=False)
-        .agg(mean_value=("value", "mean"))
-        .reset_index()
-        .merge(blanks, on="time_h", how="left")
+def _check_readouts(readouts: set[str], ratio: tuple[str, str] | None) -> None:
+    """Dataset-wide readout checks, shared by analyze and analyze_stream."""
+    if ratio is None:
+        if len(readouts) > 1:
+            raise ValueError(
+                f"Data has several readouts {sorted(readouts)}; "
+                "pass ratio=(reporter, normalizer) to analyze them together"
+            )
+        return
+    if not readouts:
+        raise ValueError("Ratio mode needs a 'readout' column in the plate data")
+    missing = [r for r in ratio if r not in readouts]
+    if missing:
+        raise ValueError(f"Readout(s) {missing} not found; available: {sorted(readouts)}")
+
+
+def _readout_ratio(df: pd.DataFrame, ratio: tuple[str, str]) -> pd.DataFrame:
+    """
+    Blank-subtracted reporter/normalizer ratio per well.
+
+    Both readouts go into one (readout x well) array; blanks are averaged per
+    readout and plate+timepoint with a single bincount, subtracted from every
+    well, and the two corrected rows divided. Blank wells are set to 0 since
+    their readouts are already subtracted. A readout missing from this data
+    gives NaN ratios (callers validate readouts over the whole dataset).
+    Wells read more than once (e.g. a re-read plate exported as a second
+    block) are averaged per readout first.
+    """
+    if "readout" not in df.columns:
+        df = df.assign(readout="")
+
+    keys = PLATE_KEYS + ["well"]
+    wells = (
+        df[df["readout"] == ratio[0]]
+        .drop(columns=["readout", "value"])
+        .drop_duplicates(keys)
+        .set_index(keys)
     )
+    reads = (
+        df.groupby(keys + ["readout"], sort=False)["value"].mean()
+        .unstack("readout")
+        .reindex(index=wells.index, columns=list(ratio))
+        .to_numpy(dtype=float)
+        .T
+    )  # shape (2, n_wells)
+
+    codes = wells.groupby(level=PLATE_KEYS, sort=False).ngroup().to_numpy()
+    n_groups = codes.max() + 1 if len(codes) else 0
+    is_blank = (wells["well_type"] == "blank").to_numpy()
+
+    valid = is_blank & ~np.isnan(reads)
+    slot = (np.arange(len(ratio))[:, None] * n_groups + codes).ravel()
+    size = len(ratio) * n_groups
+    sums = np.bincount(slot, weights=np.where(valid, reads, 0.0).ravel(), minlength=size)
+    counts = np.bincount(slot, weights=valid.ravel(), minlength=size)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        blank = (sums / counts).reshape(len(ratio), n_groups)
+        corrected = reads - blank[:, codes]
+        values = corrected[0] / corrected[1]
+
+    out = wells.reset_index()
+    out["value"] = np.where(is_blank, 0.0, values)
+    return out
+
+
+def _sum_count(df: pd.DataFrame, keys: list[str], cols: list[str]) -> pd.DataFrame:
+    # sum/count instead of mean so partial results from blocks can be added up
+    aggs = {}
+    for c in cols:
+        aggs[f"{c}_sum"] = (c, "sum")
+        aggs[f"{c}_count"] = (c, "count")
+    return df.groupby(keys, dropna=False).agg(**aggs).reset_index()
+
+
+def _partial_sums(
+    df: pd.DataFrame, controls: set[str], normalization: str | None
+) -> dict[str, pd.DataFrame]:
+    blanks_df = df[df["well_type"] == "blank"]
+    samples_df = df[df["well_type"] == "sample"].copy()
+
+    value_cols = ["value"]
+    if normalization in {"zscore", "robust_zscore", "bscore"}:
+        samples_df["score"] = _well_scores(samples_df, normalization)
+        value_cols.append("score")
+
+    return {
+        "blanks": _sum_count(blanks_df, PLATE_KEYS, ["value"]),
+        "samples": _sum_count(samples_df, PLATE_KEYS + ["sample", "condition"], value_cols),
+        "control": _sum_count(
+            samples_df[samples_df["sample"].isin(controls)],
+            PLATE_KEYS + ["condition"],
+            ["value"],
+        ),
+    }
+
+
+def _reduce_partials(partials: list[dict[str, pd.DataFrame]]) -> dict[str, pd.DataFrame]:
+    """Add up per-batch sums/counts in one concat + groupby per table."""
+    out = {}
+    for name, first in partials[0].items():
+        keys = [c for c in first.columns if not c.endswith(("_sum", "_count"))]
+        out[name] = (
+            pd.concat([p[name] for p in partials], ignore_index=True)
+            .groupby(keys, dropna=False)
+            .sum(min_count=1)
+            .reset_index()
+        )
+    return out
+
+
+def _padded(df: pd.DataFrame, keys: list[str]) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Group well values into a (groups x max replicates) NaN-padded array.
+    Returns (group keys table, values array, replicate counts).
+    """
+    df = df[df["value"].notna()]
+    grouped = df.groupby(keys, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    pos = grouped.cumcount().to_numpy()
+    groups = grouped.size().reset_index(name="n")
+    counts = groups["n"].to_numpy()
+
+    values = np.full((len(groups), counts.max() if len(counts) else 1), np.nan)
+    values[codes, pos] = df["value"].to_numpy(dtype=float)
+    return groups, values, counts
+
+
+def _resample_means(uniform: np.ndarray, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    (groups x n_boot) means of with-replacement resamples of each group,
+    given (groups x n_boot x width) uniform draws in [0, 1).
+    """
+    # draw counts[g] positions among the first counts[g] wells of group g
+    idx = (uniform * counts[:, None, None]).astype(np.intp)
+    in_group = np.arange(values.shape[1]) < counts[:, None, None]
+    draws = np.where(in_group, values[np.arange(len(values))[:, None, None], idx], 0.0)
+    return draws.sum(axis=2) / counts[:, None]
+
+
+def _chunks(sizes: np.ndarray, limit: int) -> Iterator[tuple[int, int]]:
+    # consecutive (start, stop) runs of items whose sizes add up to <= limit
+    # (an item larger than limit gets a run of its own)
+    start, total = 0, 0
+    for i, size in enumerate(sizes):
+        if i > start and total + size > limit:
+            yield start, i
+            start, total = i, 0
+        total += size
+    if len(sizes):
+        yield start, len(sizes)
+
+
+def _lookup(table: pd.DataFrame, groups: pd.DataFrame, keys: list[str]) -> np.ndarray:
+    # row of `table` matching each group on keys; len(table) (a NaN slot) if none
+    pos = table[keys].assign(_row=np.arange(len(table)))
+    rows = groups[keys].merge(pos, on=keys, how="left")["_row"]
+    return rows.fillna(len(table)).to_numpy(dtype=np.intp)
+
+
+def _bootstrap_fold_ci(
+    df: pd.DataFrame, controls: set[str], n_boot: int, ci: float, seed: int | None
+) -> pd.DataFrame:
+    """
+    Percentile bootstrap CI of fold_to_siNT for every plate/time/sample/condition.
+
+    A group's blank and control come from its own plate+timepoint, so groups
+    are resampled a few whole plate+timepoints at a time (about
+    _BOOT_BATCH_CELLS draws) and each chunk is reduced to its CI bounds
+    before the next; memory does not grow with the number of plates. Within
+    a chunk each group's wells sit in one padded array and the resample is a
+    single fancy-indexing gather. Every plate+timepoint draws from its own
+    stream spawned from seed, so the CIs do not depend on the chunking.
+    Blanks are resampled per plate+timepoint the same way; the control of
+    each resample is the well-weighted mean of its (resampled) control
+    groups, so the control itself stays exactly 1.
+    """
+    group_keys = PLATE_KEYS + ["sample", "condition"]
+    control_keys = PLATE_KEYS + ["condition"]
+
+    groups, values, counts = _padded(df[df["well_type"] == "sample"], group_keys)
+    blank_groups, blank_values, blank_counts = _padded(df[df["well_type"] == "blank"], PLATE_KEYS)
+    # NaN slot for plate+timepoints without blanks
+    blank_values = np.vstack([blank_values, np.full((1, blank_values.shape[1]), np.nan)])
+    blank_counts = np.append(blank_counts, 0)
+
+    # groups are sorted by plate+timepoint, so each one is a contiguous run
+    unit_of = groups.groupby(PLATE_KEYS, sort=True).ngroup().to_numpy()
+    units = groups[PLATE_KEYS].drop_duplicates().reset_index(drop=True)
+    bounds = np.searchsorted(unit_of, np.arange(len(units) + 1))
+    blank_of = _lookup(blank_groups, units, PLATE_KEYS)
+    ctrl_of = groups.groupby(control_keys, sort=True).ngroup().to_numpy()
+    is_ctrl = groups["sample"].isin(controls).to_numpy()
+    seeds = np.random.SeedSequence(seed).spawn(len(units))
+
+    width, blank_width = values.shape[1], blank_values.shape[1]
+    alpha = (1 - ci) / 2
+    low = np.full(len(groups), np.nan)
+    high = np.full(len(groups), np.nan)
+    cells = n_boot * (np.diff(bounds) * width + blank_width)
+
+    for u0, u1 in _chunks(cells, _BOOT_BATCH_CELLS):
+        g0, g1 = bounds[u0], bounds[u1]
+        uniform = np.empty((g1 - g0, n_boot, width))
+        blank_uniform = np.empty((u1 - u0, n_boot, blank_width))
+        for u in range(u0, u1):
+            rng = np.random.default_rng(seeds[u])
+            rng.random(out=uniform[bounds[u] - g0 : bounds[u + 1] - g0])
+            rng.random(out=blank_uniform[u - u0])
+
+        with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN groups
+            means = _resample_means(uniform, values[g0:g1], counts[g0:g1])
+            del uniform
+            b = blank_of[u0:u1]
+            blanks = _resample_means(blank_uniform, blank_values[b], blank_counts[b])
+            blanks = blanks[unit_of[g0:g1] - u0]
+
+            # pooled control per plate/time/condition as a weighted sum of group means
+            codes = ctrl_of[g0:g1] - ctrl_of[g0:g1].min()
+            ctrl_mask = is_ctrl[g0:g1]
+            weights = np.zeros((codes.max() + 1, int(ctrl_mask.sum())))
+            weights[codes[ctrl_mask], np.arange(weights.shape[1])] = counts[g0:g1][ctrl_mask]
+            total = weights.sum(axis=1, keepdims=True)
+            ctrl = (weights / total) @ means[ctrl_mask]
+            ctrl[total[:, 0] == 0] = np.nan
+
+            folds = (means - blanks) / (ctrl[codes] - blanks)
+            low[g0:g1], high[g0:g1] = np.nanpercentile(
+                folds, [100 * alpha, 100 * (1 - alpha)], axis=1
+            )
+
+    out = groups[group_keys].copy()
+    out["fold_ci_low"] = low
+    out["fold_ci_high"] = high
+    return out
+
+
+def _mean(acc: pd.DataFrame, col: str) -> pd.Series:
+    return acc[f"{col}_sum"] / acc[f"{col}_count"]
+
+
+def _finish(
+    parts: dict[str, pd.DataFrame],
+    normalization: str | None,
+    has_plate: bool,
+    fold_ci: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    # 1) shared blank per plate+timepoint
+    blanks = parts["blanks"][PLATE_KEYS].copy()
+    blanks["blank"] = _mean(parts["blanks"], "value")
+
+    # 2) replicate mean per plate/time/sample/condition
+    acc = parts["samples"]
+    samples = acc[PLATE_KEYS + ["sample", "condition"]].copy()
+    samples["mean_value"] = _mean(acc, "value")
+    if "score_sum" in acc.columns:
+        samples["score"] = _mean(acc, "score")
+    samples = samples.merge(blanks, on=PLATE_KEYS, how="left")
     samples["minus_blank"] = samples["mean_value"] - samples["blank"]
 
-    # 3) fold to siNT per time+condition
-    control = (
-        samples[samples["sample"] == CONTROL_SAMPLE]
-        .rename(columns={"minus_blank": "control_minus_blank"})
-        [["time_h", "condition", "control_minus_blank"]]
-    )
-    samples = samples.merge(control, on=["time_h", "condition"], how="left")
+    # 3) fold to control per plate+time+condition (control wells pooled)
+    control_df = parts["control"][PLATE_KEYS + ["condition"]].copy()
+    control_df["control_value"] = _mean(parts["control"], "value")
+    samples = samples.merge(control_df, on=PLATE_KEYS + ["condition"], how="left")
+    samples["control_minus_blank"] = samples["control_value"] - samples["blank"]
     samples["fold_to_siNT"] = samples["minus_blank"] / samples["control_minus_blank"]
+    if normalization == "percent_of_control":
+        samples["score"] = samples["fold_to_siNT"] * 100
+    if fold_ci is not None:
+        samples = samples.merge(fold_ci, on=PLATE_KEYS + ["sample", "condition"], how="left")
 
     # 4) Build wide output WITHOUT pivot (guarantees columns exist)
+    keys = PLATE_KEYS + ["sample"]
+    score_col = None if normalization is None else NORMALIZATIONS[normalization]
+
     def pack(cond: str) -> pd.DataFrame:
-        sub = samples[samples["condition"] == cond][
-            ["time_h", "sample", "mean_value", "minus_blank", "fold_to_siNT"]
-        ].copy()
-        sub = sub.rename(
-            columns={
-                "mean_value": f"{cond} average",
-                "minus_blank": f"{cond} minus blank",
-                "fold_to_siNT": f"{cond} (fold to siNT)",
-            }
-        )
-        return sub
+        cols = keys + ["mean_value", "minus_blank", "fold_to_siNT"]
+        renames = {
+            "mean_value": f"{cond} average",
+            "minus_blank": f"{cond} minus blank",
+            "fold_to_siNT": f"{cond} (fold to siNT)",
+        }
+        if score_col is not None:
+            cols.append("score")
+            renames["score"] = f"{cond} ({score_col})"
+        if fold_ci is not None:
+            cols += ["fold_ci_low", "fold_ci_high"]
+            renames["fold_ci_low"] = f"{cond} (fold to siNT) CI low"
+            renames["fold_ci_high"] = f"{cond} (fold to siNT) CI high"
+        sub = samples[samples["condition"] == cond][cols].copy()
+        return sub.rename(columns=renames)
 
-    wide = pack("0mM").merge(pack("2mM"), on=["time_h", "sample"], how="outer")
-    wide = wide.merge(blanks, on="time_h", how="left")
+    wide = pack("0mM").merge(pack("2mM"), on=keys, how="outer")
+    wide = wide.merge(blanks, on=PLATE_KEYS, how="left")
     wide["0mM blank"] = wide["blank"]
     wide["2mM blank"] = wide["blank"]
 
     # nice ordering
     desired = [
-        "time_h", "sample",
+        "plate", "time_h", "sample",
         "0mM average", "2mM average",
         "blank", "0mM blank", "2mM blank",
         "0mM minus blank", "2mM minus blank",
         "0mM (fold to siNT)", "2mM (fold to siNT)",
     ]
+    if score_col is not None:
+        desired += [f"0mM ({score_col})", f"2mM ({score_col})"]
+    if fold_ci is not None:
+        desired += [
+            "0mM (fold to siNT) CI low", "0mM (fold to siNT) CI high",
+            "2mM (fold to siNT) CI low", "2mM (fold to siNT) CI high",
+        ]
     cols = [c for c in desired if c in wide.columns] + [c for c in wide.columns if c not in desired]
-    wide = wide[cols].sort_values(["time_h", "sample"]).reset_index(drop=True)
+    wide = wide[cols].sort_values(keys).reset_index(drop=True)
 
+    if not has_plate:
+        wide = wide.drop(columns="plate")
     return wide
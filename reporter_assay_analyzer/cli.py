@@ -7,10 +7,16 @@ import pandas as pd
 from openpyxl import Workbook
 
 from .mapping import write_mapping_template
-from .io import parse_timepoint_hours, read_plate_matrix_xlsx
-from .stacked_parser import parse_stacked_combined_raw_xlsx
-from .analysis import analyze
-from .plots import plot_by_condition
+from .io import (
+    DEFAULT_BLOCK_CACHE,
+    parse_plate_id,
+    parse_timepoint_hours,
+    read_plate_matrices_xlsx,
+    read_plate_matrix_xlsx,
+)
+from .stacked_parser import READOUT_SEP, iter_stacked_blocks, parse_stacked_combined_raw_xlsx
+from .analysis import CONTROL_SAMPLE, NORMALIZATIONS, analyze, analyze_stream
+from .plots import plot_by_condition, plot_plate_heatmaps
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -28,12 +34,18 @@ def build_parser() -> argparse.ArgumentParser:
     c = sub.add_parser("combine-raw", help="Combine plate files into stacked Excel.")
     c.add_argument("--data-dir", required=True)
     c.add_argument("--out", required=True)
+    c.add_argument(
+        "--all-readouts", action="store_true",
+        help="Keep every readout block of each file (dual-reporter exports)",
+    )
+    _add_block_cache_options(c)
 
     # analyze
     a = sub.add_parser("analyze", help="Run final analysis.")
     a.add_argument("--combined", required=True)
     a.add_argument("--mapping", required=True)
     a.add_argument("--out", required=True)
+    _add_analysis_options(a)
 
     # plot
     pplot = sub.add_parser("plot", help="Generate plots (one per condition).")
@@ -44,6 +56,16 @@ def build_parser() -> argparse.ArgumentParser:
         help="Plot fold-change or blank-subtracted reads",
     )
 
+    # qc-plots
+    q = sub.add_parser("qc-plots", help="Raw plate heatmaps with mapping overlay for QC.")
+    q.add_argument("--combined", required=True)
+    q.add_argument("--mapping", required=True)
+    q.add_argument("--out-dir", required=True)
+    q.add_argument(
+        "--grid", nargs=2, type=int, default=[3, 4], metavar=("ROWS", "COLS"),
+        help="Plates per page",
+    )
+
     # 🚀 run (NEW)
     r = sub.add_parser("run", help="Run full pipeline: combine → analyze → plot")
     r.add_argument("--data-dir", required=True)
@@ -53,37 +75,109 @@ def build_parser() -> argparse.ArgumentParser:
         "--mode", choices=["fold", "reads"], default="fold",
         help="Plot fold-change or blank-subtracted reads",
     )
+    _add_analysis_options(r)
+    _add_block_cache_options(r)
 
     return p
 
 
-def _write_stacked_plates_excel(files: list[Path], out_path: Path) -> None:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "combined_raw"
+def _add_block_cache_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--block-cache", default=str(DEFAULT_BLOCK_CACHE),
+        help="JSON file remembering the plate-block position per export template",
+    )
+    p.add_argument(
+        "--no-block-cache", action="store_true",
+        help="Always scan each file for the plate block",
+    )
+
+
+def _block_cache(args: argparse.Namespace) -> Path | None:
+    return None if args.no_block_cache else Path(args.block_cache)
+
+
+def _add_analysis_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--control", nargs="+", default=[CONTROL_SAMPLE],
+        help="Control sample name(s); several names are pooled into one control",
+    )
+    p.add_argument(
+        "--normalization", choices=sorted(NORMALIZATIONS), default=None,
+        help="Optional extra plate normalization column",
+    )
+    p.add_argument(
+        "--stream", action="store_true",
+        help="Process one plate block at a time (bounded memory for large archives)",
+    )
+    p.add_argument(
+        "--ratio", nargs=2, metavar=("REPORTER", "NORMALIZER"), default=None,
+        help="Dual-reporter mode: analyze blank-subtracted REPORTER/NORMALIZER ratios",
+    )
+    p.add_argument(
+        "--bootstrap", type=int, default=0, metavar="N",
+        help="Add bootstrap confidence intervals on fold values from N resamples",
+    )
+    p.add_argument("--ci", type=float, default=0.95, help="Confidence level for --bootstrap")
+    p.add_argument("--seed", type=int, default=0, help="Random seed for --bootstrap")
+
+
+def _analyze_combined(combined: Path, mapping: pd.DataFrame, args: argparse.Namespace) -> pd.DataFrame:
+    if args.stream:
+        return analyze_stream(
+            iter_stacked_blocks(combined), mapping,
+            control=args.control, normalization=args.normalization, ratio=args.ratio,
+        )
+    tidy = parse_stacked_combined_raw_xlsx(combined)
+    return analyze(
+        tidy, mapping,
+        control=args.control, normalization=args.normalization, ratio=args.ratio,
+        bootstrap=args.bootstrap, ci=args.ci, seed=args.seed,
+    )
+
+
+def _plate_sort_key(p: Path) -> tuple[str, int]:
+    return parse_plate_id(p.name) or "", parse_timepoint_hours(p.name)
+
 
-    start_row = 1
-    files = sorted(files, key=lambda p: parse_timepoint_hours(p.name))
+def _write_stacked_plates_excel(
+    files: list[Path],
+    out_path: Path,
+    cache_path: Path | None = None,
+    all_readouts: bool = False,
+) -> None:
+    # write-only workbook: rows are flushed as they are appended, so only
+    # one plate is held in memory at a time
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("combined_raw")
 
+    files = sorted(files, key=_plate_sort_key)
+
+    first = True
     for f in files:
         t_h = parse_timepoint_hours(f.name)
+        plate_id = parse_plate_id(f.name)
         title = f"{t_h}h post transfection"
-        plate = read_plate_matrix_xlsx(f)
+        if plate_id is not None:
+            title = f"Plate {plate_id} - {title}"
 
-        ws.cell(row=start_row, column=1, value=title)
+        if all_readouts:
+            # one block per readout, named in the title ('... | Lum')
+            plates = read_plate_matrices_xlsx(f, cache_path)
+            blocks = [(f"{title}{READOUT_SEP}{name}", m) for name, m in plates.items()]
+        else:
+            blocks = [(title, read_plate_matrix_xlsx(f, cache_path))]
 
-        header_row = start_row + 1
-        for j, col_num in enumerate(range(1, 13), start=2):
-            ws.cell(row=header_row, column=j, value=col_num)
+        for block_title, plate in blocks:
+            if not first:
+                ws.append([])  # spacer row between blocks
+            first = False
 
-        for i, row_letter in enumerate("ABCDEFGH"):
-            r = start_row + 2 + i
-            ws.cell(row=r, column=1, value=row_letter)
-            for j, col_num in enumerate(range(1, 13), start=2):
-                val = plate.loc[row_letter, col_num]
-                ws.cell(row=r, column=j, value=None if pd.isna(val) else float(val))
+            ws.append([block_title])
+            ws.append([None] + list(range(1, 13)))
 
-        start_row += 11
+            for row_letter in "ABCDEFGH":
+                vals = plate.loc[row_letter, list(range(1, 13))].tolist()
+                ws.append([row_letter] + [None if pd.isna(v) else float(v) for v in vals])
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     wb.save(out_path)
@@ -92,6 +186,12 @@ def _write_stacked_plates_excel(files: list[Path], out_path: Path) -> None:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if getattr(args, "stream", False) and getattr(args, "bootstrap", 0):
+        parser.error("--bootstrap needs the wells of every group at once; drop --stream")
+    if getattr(args, "bootstrap", 0) < 0:
+        parser.error("--bootstrap must be >= 0")
+    if not 0 < getattr(args, "ci", 0.95) < 1:
+        parser.error("--ci must be between 0 and 1 (e.g. 0.95)")
 
     if args.command == "make-template":
         write_mapping_template(Path(args.out))
@@ -100,14 +200,15 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.command == "combine-raw":
         files = list(Path(args.data_dir).glob("*.xlsx"))
-        _write_stacked_plates_excel(files, Path(args.out))
+        _write_stacked_plates_excel(
+            files, Path(args.out), _block_cache(args), all_readouts=args.all_readouts
+        )
         print("✅ combined_raw.xlsx created")
         return 0
 
     if args.command == "analyze":
-        tidy = parse_stacked_combined_raw_xlsx(Path(args.combined))
         mapping = pd.read_csv(args.mapping)
-        result = analyze(tidy, mapping)
+        result = _analyze_combined(Path(args.combined), mapping, args)
         Path(args.out).parent.mkdir(parents=True, exist_ok=True)
         result.to_excel(args.out, index=False)
         print("✅ final_analysis.xlsx created")
@@ -124,6 +225,16 @@ def main(argv: list[str] | None = None) -> int:
         print("✅ plots created")
         return 0
 
+    if args.command == "qc-plots":
+        pages = plot_plate_heatmaps(
+            iter_stacked_blocks(Path(args.combined)),
+            pd.read_csv(args.mapping),
+            Path(args.out_dir),
+            grid=tuple(args.grid),
+        )
+        print(f"✅ {len(pages)} QC page(s) created")
+        return 0
+
     # 🚀 RUN COMMAND
     if args.command == "run":
         out_dir = Path(args.out_dir)
@@ -134,11 +245,12 @@ def main(argv: list[str] | None = None) -> int:
         plots_dir = out_dir / "plots"
 
         files = list(Path(args.data_dir).glob("*.xlsx"))
-        _write_stacked_plates_excel(files, combined)
+        _write_stacked_plates_excel(
+            files, combined, _block_cache(args), all_readouts=args.ratio is not None
+        )
 
-        tidy = parse_stacked_combined_raw_xlsx(combined)
         mapping = pd.read_csv(args.mapping)
-        result = analyze(tidy, mapping)
+        result = _analyze_combined(combined, mapping, args)
         result.to_excel(final, index=False)
 
         plot_by_condition(
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 from pathlib import Path
+from typing import Iterator
+
 import pandas as pd
 
 
 _TIME_RE = re.compile(r"(\d+)\s*h", re.IGNORECASE)
+# plate ids are a number or a single letter ('plate3', 'Plate B'); words like
+# 'plate reader' or 'plate_map' are not ids
+_PLATE_RE = re.compile(r"\bplate[\s_-]*(\d+|[A-Z])(?![A-Za-z0-9])", re.IGNORECASE)
+
+# where the CLI remembers plate-block positions per export template
+DEFAULT_BLOCK_CACHE = Path.home() / ".cache" / "reporter_assay_analyzer" / "plate_blocks.json"
 
 
 def parse_timepoint_hours(filename: str) -> int:
@@ -20,6 +30,55 @@ def parse_timepoint_hours(filename: str) -> int:
     return int(m.group(1))
 
 
+def parse_plate_id(filename: str) -> str | None:
+    """
+    Extract an optional plate id from a filename or block title like:
+    'plate3 2h post transfection.xlsx' -> '3'
+    'Plate B - 2h post transfection' -> 'B'
+    '2h post transfection.xlsx' -> None
+    """
+    m = _PLATE_RE.search(filename)
+    return m.group(1) if m else None
+
+
+_NO_BLOCK_MSG = (
+    "Could not locate the 8x12 plate block (A-H rows, 1-12 columns) in the Excel file. "
+    "If your export format changed, we can adjust the detector."
+)
+
+
+def _header_numbers(chunk: list) -> list[int | None]:
+    norm = []
+    for x in chunk:
+        if pd.isna(x):
+            norm.append(None)
+        else:
+            s = str(x).strip()
+            # allow "1", 1, "1.0"
+            try:
+                norm.append(int(float(s)))
+            except Exception:
+                norm.append(None)
+    return norm
+
+
+def _has_row_labels(df: pd.DataFrame, r: int, c: int) -> bool:
+    # check row labels directly to the left (c-1) in the next 8 rows
+    if c - 1 < 0:
+        return False
+    labels = df.iloc[r + 1 : r + 9, c - 1].tolist()
+    labels = [str(x).strip().upper() if not pd.isna(x) else "" for x in labels]
+    return labels == list("ABCDEFGH")
+
+
+def _is_plate_block(df: pd.DataFrame, r: int, c: int) -> bool:
+    """Cheap check that (r, c) is the top-left corner of the 8x12 plate block."""
+    if not (0 <= r < df.shape[0] and 0 <= c <= df.shape[1] - 12):
+        return False
+    header = _header_numbers(df.iloc[r, c : c + 12].tolist())
+    return header == list(range(1, 13)) and _has_row_labels(df, r, c)
+
+
 def _find_plate_block(df: pd.DataFrame) -> tuple[int, int]:
     """
     Try to locate the top-left corner of an 8x12 plate matrix in a messy Excel sheet.
@@ -34,45 +93,160 @@ def _find_plate_block(df: pd.DataFrame) -> tuple[int, int]:
         df.iloc[top_row_index, left_col_index] == 1
         and df.iloc[top_row_index+1:top_row_index+9, left_col_index-1] == A..H
     """
+    for pos in _iter_plate_blocks(df):
+        return pos
+
+    raise ValueError(_NO_BLOCK_MSG)
+
+
+def _iter_plate_blocks(df: pd.DataFrame, start_row: int = 0) -> Iterator[tuple[int, int]]:
     # brute-force scan: look for a row containing 1..12 (as ints or strings)
-    for r in range(df.shape[0]):
+    for r in range(start_row, df.shape[0]):
         row = df.iloc[r, :].tolist()
         # find potential start col where 1..12 appear consecutively
         for c in range(df.shape[1] - 11):
-            chunk = row[c : c + 12]
-            norm = []
-            for x in chunk:
-                if pd.isna(x):
-                    norm.append(None)
-                else:
-                    s = str(x).strip()
-                    # allow "1", 1, "1.0"
-                    try:
-                        norm.append(int(float(s)))
-                    except Exception:
-                        norm.append(None)
-            if norm == list(range(1, 13)):
-                # check row labels directly to the left (c-1) in the next 8 rows
-                if c - 1 < 0:
-                    continue
-                labels = df.iloc[r + 1 : r + 9, c - 1].tolist()
-                labels = [str(x).strip().upper() if not pd.isna(x) else "" for x in labels]
-                if labels == list("ABCDEFGH"):
-                    return r, c
-
-    raise ValueError(
-        "Could not locate the 8x12 plate block (A-H rows, 1-12 columns) in the Excel file. "
-        "If your export format changed, we can adjust the detector."
-    )
-
-
-def read_plate_xlsx(path: Path) -> pd.DataFrame:
+            if _header_numbers(row[c : c + 12]) == list(range(1, 13)):
+                if _has_row_labels(df, r, c):
+                    yield r, c
+
+
+def _find_plate_blocks(df: pd.DataFrame) -> list[tuple[int, int]]:
+    """
+    Like _find_plate_block, but return every 8x12 block in the sheet (top to
+    bottom), e.g. the reporter and normalizer reads of a dual-readout export.
+    """
+    blocks = list(_iter_plate_blocks(df))
+    if not blocks:
+        raise ValueError(_NO_BLOCK_MSG)
+    return blocks
+
+
+def template_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint the reader export template of a raw sheet.
+
+    Uses the sheet width plus the metadata labels in the first column
+    (e.g. 'Software Version', 'Plate Number', 'Results') and their rows.
+    The values next to them (dates, times, plate numbers) change per file
+    and are ignored, as is the sheet height, which grows when notes or
+    hand calculations are added below the plate.
+    """
+    first_col = df.iloc[:, 0].tolist() if df.shape[1] else []
+    labels = [[r, x.strip()] for r, x in enumerate(first_col) if isinstance(x, str) and x.strip()]
+    payload = json.dumps([df.shape[1], labels])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# layouts remembered per template fingerprint (most recently used first)
+_MAX_CACHED_LAYOUTS = 4
+
+
+def _load_block_cache(cache_path: Path) -> dict[str, list]:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _as_layout(entry) -> list[tuple[int, int]] | None:
+    try:
+        blocks = [(int(r), int(c)) for r, c in entry]
+    except (TypeError, ValueError):
+        return None
+    return blocks or None
+
+
+def _further_block(df: pd.DataFrame, start_row: int, c: int) -> bool:
+    # a further block of the same template starts in the same column, so only
+    # rows there whose first header cell reads 1 need the full check
+    col = pd.to_numeric(df.iloc[start_row:, c], errors="coerce")
+    return any(_is_plate_block(df, start_row + i, c) for i in (col.to_numpy() == 1).nonzero()[0])
+
+
+def _layout_matches(df: pd.DataFrame, blocks: list[tuple[int, int]]) -> bool:
+    if not all(_is_plate_block(df, r, c) for r, c in blocks):
+        return False
+    # a sheet with more readouts than this layout (e.g. a dual-readout export
+    # sharing the template of a single-readout one) must not reuse it
+    last_r, last_c = max(blocks)
+    return not _further_block(df, last_r + 9, last_c)
+
+
+def _cached_layouts(df: pd.DataFrame, cache_path: Path) -> tuple[str, dict, list[list[tuple[int, int]]]]:
+    key = template_fingerprint(df)
+    cache = _load_block_cache(cache_path)
+    entry = cache.get(key)
+    layouts = [lay for lay in map(_as_layout, entry if isinstance(entry, list) else []) if lay]
+    return key, cache, layouts
+
+
+def _store_layout(cache_path: Path, cache: dict, key: str,
+                  blocks: list[tuple[int, int]], layouts: list[list[tuple[int, int]]]) -> None:
+    layouts = [blocks] + [lay for lay in layouts if lay != blocks]
+    cache[key] = [[[r, c] for r, c in lay] for lay in layouts[:_MAX_CACHED_LAYOUTS]]
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    except OSError:
+        pass  # caching is best-effort; the detected position is still valid
+
+
+def locate_plate_blocks(df: pd.DataFrame, cache_path: Path | None = None) -> list[tuple[int, int]]:
+    """
+    _find_plate_blocks with a persistent per-template position cache.
+
+    cache_path is a JSON file mapping template_fingerprint -> a few block
+    layouts (each a list of [top_row, left_col]), since exports with the
+    same template may hold one or several readouts. A cached layout is used
+    if its blocks verify (_is_plate_block) and no further block starts in
+    the same column below the last one; otherwise the sheet is fully
+    scanned and the new layout cached. cache_path=None disables caching.
+    """
+    if cache_path is None:
+        return _find_plate_blocks(df)
+
+    key, cache, layouts = _cached_layouts(df, cache_path)
+    for i, blocks in enumerate(layouts):
+        if _layout_matches(df, blocks):
+            if i == 0:
+                return blocks
+            break
+    else:
+        blocks = _find_plate_blocks(df)
+
+    _store_layout(cache_path, cache, key, blocks, layouts)
+    return blocks
+
+
+def locate_plate_block(df: pd.DataFrame, cache_path: Path | None = None) -> tuple[int, int]:
+    """
+    First plate block of the sheet, with the cache of locate_plate_blocks.
+
+    Only the first block of each cached layout is verified, and a miss stops
+    scanning at the first block found (it is cached as a one-block layout;
+    locate_plate_blocks rescans if the sheet turns out to hold more).
+    """
+    if cache_path is None:
+        return _find_plate_block(df)
+
+    key, cache, layouts = _cached_layouts(df, cache_path)
+    for blocks in layouts:
+        if _is_plate_block(df, *blocks[0]):
+            return blocks[0]
+
+    pos = _find_plate_block(df)
+    _store_layout(cache_path, cache, key, [pos], layouts)
+    return pos
+
+
+def read_plate_xlsx(path: Path, cache_path: Path | None = None) -> pd.DataFrame:
     """
     Read one plate export (xlsx) and return tidy data:
       columns: well, value
     """
     raw = pd.read_excel(path, header=None, engine="openpyxl")
-    top_r, left_c = _find_plate_block(raw)
+    top_r, left_c = locate_plate_block(raw, cache_path)
 
     # plate values are in rows A..H => top_r+1 .. top_r+8, cols 1..12 => left_c .. left_c+11
     block = raw.iloc[top_r + 1 : top_r + 9, left_c : left_c + 12].copy()
@@ -90,20 +264,51 @@ def read_plate_xlsx(path: Path) -> pd.DataFrame:
     # enforce numeric where possible
     tidy["value"] = pd.to_numeric(tidy["value"], errors="coerce")
     return tidy
-def read_plate_matrix_xlsx(path: Path) -> pd.DataFrame:
+def _block_matrix(raw: pd.DataFrame, top_r: int, left_c: int) -> pd.DataFrame:
+    block = raw.iloc[top_r + 1 : top_r + 9, left_c : left_c + 12].copy()
+    block.index = list("ABCDEFGH")
+    block.columns = list(range(1, 13))
+
+    # numeric conversion
+    block = block.apply(pd.to_numeric, errors="coerce")
+    return block
+
+
+def _readout_label(raw: pd.DataFrame, top_r: int, left_c: int) -> str | None:
+    # the reader writes the read name (e.g. 'Lum') right of the A row
+    if left_c + 12 >= raw.shape[1]:
+        return None
+    label = raw.iloc[top_r + 1, left_c + 12]
+    return label.strip() if isinstance(label, str) and label.strip() else None
+
+
+def read_plate_matrix_xlsx(path: Path, cache_path: Path | None = None) -> pd.DataFrame:
     """
     Read one plate export (xlsx) and return an 8x12 matrix:
       index: A..H
       columns: 1..12
+
+    If the export holds several readouts, this is the first one.
+    cache_path: optional plate-block position cache (see locate_plate_block)
     """
     raw = pd.read_excel(path, header=None, engine="openpyxl")
-    top_r, left_c = _find_plate_block(raw)
+    top_r, left_c = locate_plate_block(raw, cache_path)
+    return _block_matrix(raw, top_r, left_c)
 
-    block = raw.iloc[top_r + 1 : top_r + 9, left_c : left_c + 12].copy()
-    block.index = list("ABCDEFGH")
-    block.columns = list(range(1, 13))
 
-    # numeric conversion
-    block = block.apply(pd.to_numeric, errors="coerce")
-    return block
+def read_plate_matrices_xlsx(path: Path, cache_path: Path | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Read every readout of one plate export (xlsx) in a single parse, e.g.
+    NanoLuc plus a firefly/fluorescent normalizer read from the same wells.
+
+    Returns {readout label: 8x12 matrix} in sheet order. Labels come from the
+    read name the reader writes next to each block ('Lum', ...); if they are
+    missing or not unique, 'readout1', 'readout2', ... are used instead.
+    """
+    raw = pd.read_excel(path, header=None, engine="openpyxl")
+    blocks = locate_plate_blocks(raw, cache_path)
 
+    labels = [_readout_label(raw, r, c) for r, c in blocks]
+    if None in labels or len(set(labels)) != len(labels):
+        labels = [f"readout{i}" for i in range(1, len(blocks) + 1)]
+    return {label: _block_matrix(raw, r, c) for label, (r, c) in zip(labels, blocks)}
@@ -1,8 +1,23 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.patches import Rectangle
+
+PLATE_ROWS = "ABCDEFGH"
+
+# mapping overlay style per well_type (drawn on top of the raw heatmap)
+_OVERLAY_STYLE = {
+    "blank": {"marker": "x", "color": "red", "s": 30},
+    "sample": {"marker": ".", "color": "black", "s": 8},
+    "unused": {"marker": "s", "color": "lightgrey", "s": 40, "alpha": 0.6},
+}
 
 
 def plot_by_condition(
@@ -23,6 +38,9 @@ def plot_by_condition(
     y_mode:
       - "fold"  -> uses 'XmM (fold to siNT)'
       - "reads" -> uses 'XmM minus blank'
+
+    Multi-plate tables (with a 'plate' column) are pooled: each point is the
+    mean of that sample's per-plate values at that timepoint.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -61,7 +79,8 @@ def plot_by_condition(
 
     def make_one(cond_label: str, y_col: str, out_name: str) -> None:
         # Build a wide plotting frame: index=time_h, columns=sample
-        plot_df = df.pivot_table(index="time_h", columns="sample", values=y_col, aggfunc="first")
+        # (mean pools the plates of multi-plate screens; one row per cell otherwise)
+        plot_df = df.pivot_table(index="time_h", columns="sample", values=y_col, aggfunc="mean")
         plot_df = plot_df.sort_index()
 
         plt.figure()
@@ -82,3 +101,183 @@ def plot_by_condition(
 
     make_one("0mM", col_0, "0mM_timecourse.png")
     make_one("2mM", col_2, "2mM_timecourse.png")
+
+
+def _block_title(block: pd.DataFrame) -> str:
+    title = f"{block['time_h'].iloc[0]}h"
+    if "plate" in block.columns and block["plate"].iloc[0]:
+        title = f"Plate {block['plate'].iloc[0]} - {title}"
+    if "readout" in block.columns and block["readout"].iloc[0]:
+        title = f"{title} | {block['readout'].iloc[0]}"
+    return title
+
+
+def _well_rc(wells: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    # 'a1' / ' B12' -> 0-based (row, col); anything outside A1..H12 is an error
+    wells = wells.astype(str).str.strip().str.upper()
+    parts = wells.str.extract(rf"^([{PLATE_ROWS}])(\d+)$")
+    cols = pd.to_numeric(parts[1])
+    bad = parts[0].isna() | ~cols.between(1, 12)
+    if bad.any():
+        raise ValueError(f"Invalid well ids (expected A1..H12): {sorted(wells[bad].unique().tolist())}")
+    rows = parts[0].map(PLATE_ROWS.index).to_numpy(dtype=int)
+    return rows, cols.to_numpy(dtype=int) - 1
+
+
+def _overlay_offsets(mapping: pd.DataFrame) -> dict[str, np.ndarray]:
+    # (x, y) = (col, row) positions of each well type, for scatter set_offsets
+    out = {}
+    for well_type in _OVERLAY_STYLE:
+        sub = mapping[mapping["well_type"] == well_type]
+        rows, cols = _well_rc(sub["well"])
+        out[well_type] = np.column_stack([cols, rows]).astype(float)
+    return out
+
+
+def plot_plate_heatmaps(
+    blocks: Iterable[pd.DataFrame],
+    mapping: pd.DataFrame,
+    out_dir: Path,
+    grid: tuple[int, int] = (3, 4),
+) -> list[Path]:
+    """
+    Render raw-value heatmaps of every plate block for visual QC
+    (edge effects, pipetting errors), grid[0] x grid[1] plates per page.
+
+    blocks: tidy plate blocks (time_h, well, value, optional plate/readout),
+      e.g. from iter_stacked_blocks
+    mapping: well, well_type (optional: plate); blank / sample / unused wells
+      are marked on top of the heatmap
+
+    One figure with one image and one scatter per well type per panel is
+    created up front. Axes, ticks and the legend are drawn once and cached;
+    every page restores that background and draws only the images,
+    scatters, titles and colorbar on top of it, so hundreds of plates render
+    without redrawing the static parts. Colors use one log scale per page;
+    a page without positive reads falls back to 1..10 and says so in its
+    title. Returns the written page paths.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    mapping = mapping.copy()
+    mapping["well"] = mapping["well"].astype(str).str.strip()
+    mapping["well_type"] = mapping["well_type"].astype(str).str.strip().str.lower()
+    per_plate_mapping = "plate" in mapping.columns
+    if per_plate_mapping:
+        mapping["plate"] = mapping["plate"].astype(str).str.strip()
+        overlays = {
+            plate: _overlay_offsets(sub) for plate, sub in mapping.groupby("plate")
+        }
+    else:
+        shared_overlay = _overlay_offsets(mapping)
+
+    nrows, ncols = grid
+    fig, axes = plt.subplots(
+        nrows, ncols, figsize=(3.2 * ncols, 2.4 * nrows + 0.6), dpi=120, squeeze=False
+    )
+    norm = LogNorm(vmin=1, vmax=10)
+    empty = np.full((8, 12), np.nan)
+
+    panels = []
+    for ax in axes.ravel():
+        im = ax.imshow(empty, norm=norm, cmap="viridis", aspect="auto")
+        scatters = {
+            wt: ax.scatter(np.empty(0), np.empty(0), label=wt, **style)
+            for wt, style in _OVERLAY_STYLE.items()
+        }
+        ax.set_xticks(range(12), [str(c) for c in range(1, 13)], fontsize=6)
+        ax.set_yticks(range(8), list(PLATE_ROWS), fontsize=6)
+        ax.tick_params(length=0)
+        panels.append((ax, im, scatters))
+
+    cbar = fig.colorbar(panels[0][1], ax=axes.ravel().tolist(), shrink=0.8, label="Raw value")
+    handles = list(panels[0][2].values())
+    fig.legend(handles, list(_OVERLAY_STYLE), loc="lower center", ncol=3, frameon=False)
+    note = fig.suptitle("", fontsize=9, color="red")
+
+    # per-page artists are animated (left out of the cached background)
+    for ax, im, scatters in panels:
+        for artist in [im, ax.title, *scatters.values()]:
+            artist.set_animated(True)
+    cbar.ax.set_animated(True)
+    note.set_animated(True)
+
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    # covers for the panels left empty on the last page
+    renderer = canvas.get_renderer()
+    covers = []
+    for ax, _, _ in panels:
+        box = ax.get_tightbbox(renderer).padded(2).transformed(fig.transFigure.inverted())
+        covers.append(fig.add_artist(Rectangle(
+            (box.x0, box.y0), box.width, box.height, transform=fig.transFigure,
+            facecolor=fig.get_facecolor(), edgecolor="none", animated=True,
+        )))
+
+    written: list[Path] = []
+    positions: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}  # blocks share well orders
+
+    def render(page: list[pd.DataFrame]) -> None:
+        values = []
+        for (ax, im, scatters), block in zip(panels, page):
+            matrix = np.full((8, 12), np.nan)
+            wells = tuple(block["well"])
+            if wells not in positions:
+                positions[wells] = _well_rc(block["well"])
+            rows, cols = positions[wells]
+            matrix[rows, cols] = block["value"].to_numpy(dtype=float)
+            im.set_data(matrix)
+            values.append(matrix)
+
+            if per_plate_mapping:
+                plate = str(block["plate"].iloc[0]).strip() if "plate" in block.columns else ""
+                offsets = overlays.get(plate, {})
+            else:
+                offsets = shared_overlay
+            for wt, sc in scatters.items():
+                sc.set_offsets(offsets.get(wt, np.empty((0, 2))))
+
+            ax.set_title(_block_title(block), fontsize=8)
+
+        # one shared log color scale per page (non-positive reads are masked)
+        page_values = np.concatenate([m.ravel() for m in values])
+        positive = page_values[page_values > 0]
+        if positive.size:
+            vmin, vmax = positive.min(), positive.max()
+            norm.vmin, norm.vmax = vmin, vmax if vmax > vmin else vmin * 10
+            note.set_text("")
+        else:
+            # don't carry the previous page's scale over
+            norm.vmin, norm.vmax = 1, 10
+            note.set_text("No positive values on this page (color scale 1-10)")
+
+        canvas.restore_region(background)
+        for ax, im, scatters in panels[:len(page)]:
+            fig.draw_artist(im)
+            for spine in ax.spines.values():
+                fig.draw_artist(spine)  # keep the frame on top of the image
+            for sc in scatters.values():
+                fig.draw_artist(sc)
+            fig.draw_artist(ax.title)
+        for cover in covers[len(page):]:
+            fig.draw_artist(cover)
+        fig.draw_artist(cbar.ax)
+        fig.draw_artist(note)
+
+        out = out_dir / f"qc_page_{len(written) + 1:03d}.png"
+        plt.imsave(out, np.asarray(canvas.buffer_rgba()), dpi=fig.dpi)
+        written.append(out)
+
+    page: list[pd.DataFrame] = []
+    for block in blocks:
+        page.append(block)
+        if len(page) == len(panels):
+            render(page)
+            page = []
+    if page:
+        render(page)
+
+    plt.close(fig)
+    return written
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
+from typing import Iterator
+
 import pandas as pd
+from openpyxl import load_workbook
+
+from .io import parse_plate_id
 
 _TIME_RE = re.compile(r"(\d+)\s*h", re.IGNORECASE)
 
+# separates the readout name in block titles of multi-readout exports
+READOUT_SEP = " | "
+
 
 def parse_time_from_title(title: str) -> int:
     m = _TIME_RE.search(str(title))
@@ -14,11 +22,100 @@ def parse_time_from_title(title: str) -> int:
     return int(m.group(1))
 
 
+def parse_readout_from_title(title: str) -> str | None:
+    """'0h post transfection | Lum' -> 'Lum'; single-readout titles -> None."""
+    _, sep, label = str(title).rpartition(READOUT_SEP)
+    if not sep or not label.strip():
+        return None
+    return label.strip()
+
+
+def _cell(row: tuple, i: int):
+    return row[i] if i < len(row) else None
+
+
+def _is_header(row: tuple) -> bool:
+    # 1..12 in columns 1..12 (B..M)
+    try:
+        return [int(_cell(row, j)) for j in range(1, 13)] == list(range(1, 13))
+    except Exception:
+        return False
+
+
+def iter_stacked_blocks(path: Path, sheet_name: str = "combined_raw") -> Iterator[pd.DataFrame]:
+    """
+    Stream the 'stacked plates' combined_raw.xlsx one block at a time.
+
+    Yields one tidy DataFrame (time_h, well, value, plus 'plate' / 'readout'
+    when the block title names one) per plate+timepoint(+readout) block. The workbook is read
+    in openpyxl's read-only mode, so only the current block is in memory.
+    See parse_stacked_combined_raw_xlsx for the expected block format.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+
+        row = next(rows, None)
+        while row is not None:
+            title = _cell(row, 0)
+            if title is None or pd.isna(title):
+                row = next(rows, None)
+                continue
+
+            # detect a block by checking the next row is the 1..12 header
+            header = next(rows, None)
+            if header is None:
+                break
+            if not _is_header(header):
+                row = header
+                continue
+
+            time_h = parse_time_from_title(str(title))
+            plate = parse_plate_id(str(title))
+            readout = parse_readout_from_title(str(title))
+
+            # rows A..H
+            wells, values = [], []
+            for row_letter in "ABCDEFGH":
+                body = next(rows, None)
+                if body is None:
+                    break
+                label = str(_cell(body, 0)).strip().upper()
+                if label != row_letter:
+                    # layout mismatch; skip row safely
+                    continue
+                for col_idx in range(1, 13):  # B..M
+                    wells.append(f"{row_letter}{col_idx}")
+                    values.append(_cell(body, col_idx))
+
+            if wells:
+                block = pd.DataFrame({
+                    "time_h": time_h,
+                    "well": wells,
+                    "value": pd.to_numeric(pd.Series(values, dtype=object), errors="coerce"),
+                })
+                if plate is not None:
+                    block.insert(0, "plate", plate)
+                if readout is not None:
+                    block["readout"] = readout
+                yield block
+
+            # skip the spacer row, then the next block's title row
+            next(rows, None)
+            row = next(rows, None)
+    finally:
+        wb.close()
+
+
 def parse_stacked_combined_raw_xlsx(path: Path, sheet_name: str = "combined_raw") -> pd.DataFrame:
     """
     Parse the 'stacked plates' combined_raw.xlsx (the pretty format you wanted)
     into tidy rows: time_h, well, value.
 
+    If any block title names a plate (e.g. 'Plate 3 - 0h post transfection'),
+    a 'plate' column is added as well; if titles name a readout
+    ('0h post transfection | Lum'), a 'readout' column is added.
+
     Expected block format:
       Row 1: title like '0h post transfection'
       Row 2: header with 1..12 in columns B..M
@@ -27,55 +124,20 @@ def parse_stacked_combined_raw_xlsx(path: Path, sheet_name: str = "combined_raw"
       Row 11: blank spacer
       Then repeats
     """
-    df = pd.read_excel(path, sheet_name=sheet_name, header=None, engine="openpyxl")
-
-    rows = []
-    r = 0
-    n = df.shape[0]
-
-    while r < n:
-        title = df.iloc[r, 0]
-        if pd.isna(title):
-            r += 1
-            continue
-
-        # detect a block by checking the next row has 1..12 in columns 1..12 (B..M)
-        header = df.iloc[r + 1, 1:13].tolist() if r + 1 < n else []
-        try:
-            header_norm = [int(x) for x in header]
-        except Exception:
-            header_norm = []
-
-        if header_norm != list(range(1, 13)):
-            r += 1
-            continue
-
-        time_h = parse_time_from_title(str(title))
-
-        # rows A..H
-        for i, row_letter in enumerate("ABCDEFGH"):
-            rr = r + 2 + i
-            if rr >= n:
-                break
-            label = str(df.iloc[rr, 0]).strip().upper()
-            if label != row_letter:
-                # layout mismatch; skip block safely
-                continue
-
-            values = df.iloc[rr, 1:13].tolist()  # B..M
-            for col_idx, val in enumerate(values, start=1):
-                well = f"{row_letter}{col_idx}"
-                value = pd.to_numeric(val, errors="coerce")
-                rows.append({"time_h": time_h, "well": well, "value": value})
-
-        # jump to next block (title row of next block)
-        r = r + 11
-
-    if not rows:
+    blocks = list(iter_stacked_blocks(path, sheet_name=sheet_name))
+    if not blocks:
         raise ValueError(
             "Parsed 0 rows from combined_raw.xlsx. "
             "Make sure the file is the stacked-plates format and the sheet name is 'combined_raw'."
         )
 
-    tidy = pd.DataFrame(rows).sort_values(["time_h", "well"]).reset_index(drop=True)
+    tidy = pd.concat(blocks, ignore_index=True)
+    keys = ["time_h", "well"]
+    if "plate" in tidy.columns:
+        tidy["plate"] = tidy["plate"].fillna("")
+        keys = ["plate"] + keys
+    if "readout" in tidy.columns:
+        tidy["readout"] = tidy["readout"].fillna("")
+        keys = keys + ["readout"]
+    tidy = tidy.sort_values(keys).reset_index(drop=True)
     return tidy
@@ -1,5 +1,5 @@
 import pandas as pd
-from reporter_assay_analyzer.analysis import analyze
+from reporter_assay_analyzer.analysis import analyze, analyze_stream
 
 
 def test_analyze_produces_fold_columns():
@@ -27,3 +27,210 @@ def test_analyze_produces_fold_columns():
     # siNT fold should be 1 (minus_blank / minus_blank)
     nt_rows = out[out["sample"] == "siNT"]
     assert all(abs(x - 1.0) < 1e-9 for x in nt_rows["0mM (fold to siNT)"].dropna())
+
+
+def test_analyze_uses_plate_wise_blanks_and_controls():
+    # same layout on two plates, each with its own blank and siNT level
+    tidy = pd.DataFrame({
+        "plate": ["1"] * 4 + ["2"] * 4,
+        "time_h": [0] * 8,
+        "well":  ["A1", "A2", "A6", "B6"] * 2,
+        "value": [110, 210, 10, 10,  1020, 2020, 20, 20],
+    })
+    mapping = pd.DataFrame({
+        "well": ["A1", "A2", "A6", "B6"],
+        "sample": ["siNT", "siFAM", "blank", "blank"],
+        "condition": ["0mM", "0mM", "all", "all"],
+        "well_type": ["sample", "sample", "blank", "blank"],
+    })
+
+    out = analyze(tidy, mapping, normalization="percent_of_control")
+
+    assert out["plate"].tolist() == ["1", "1", "2", "2"]
+    assert out["blank"].tolist() == [10, 10, 20, 20]
+    fam = out[out["sample"] == "siFAM"]
+    assert fam["0mM (fold to siNT)"].tolist() == [2.0, 2.0]
+    assert fam["0mM (% of control)"].tolist() == [200.0, 200.0]
+
+
+def test_analyze_pools_control_set_and_scores_plates():
+    tidy = pd.DataFrame({
+        "time_h": [0] * 5,
+        "well":  ["A1", "A2", "A3", "A6", "B6"],
+        "value": [100, 300, 410, 10, 10],
+    })
+    mapping = pd.DataFrame({
+        "well": ["A1", "A2", "A3", "A6", "B6"],
+        "sample": ["siNT", "siNT2", "siFAM", "blank", "blank"],
+        "condition": ["0mM", "0mM", "0mM", "all", "all"],
+        "well_type": ["sample", "sample", "sample", "blank", "blank"],
+    })
+
+    out = analyze(tidy, mapping, control=["siNT", "siNT2"], normalization="zscore")
+
+    assert "plate" not in out.columns
+    fam = out[out["sample"] == "siFAM"].iloc[0]
+    # control = mean(100, 300) - 10 = 190
+    assert abs(fam["0mM (fold to siNT)"] - 400 / 190) < 1e-9
+    assert abs(out["0mM (z-score)"].sum()) < 1e-9
+
+
+def test_analyze_stream_matches_analyze_across_split_blocks():
+    tidy = pd.DataFrame({
+        "time_h": [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+        "well":   ["A1", "B1", "A2", "B2", "A6", "B6", "A1", "A2", "A6", "B6"],
+        "value":  [100, 120, 200, 260, 10, 14, 110, 220, 10, 10],
+    })
+    mapping = pd.DataFrame({
+        "well": ["A1", "B1", "A2", "B2", "A6", "B6"],
+        "sample": ["siNT", "siNT", "siFAM", "siFAM", "blank", "blank"],
+        "condition": ["0mM", "0mM", "0mM", "0mM", "all", "all"],
+        "well_type": ["sample", "sample", "sample", "sample", "blank", "blank"],
+    })
+
+    # replicates and blanks of timepoint 0 are split over two blocks
+    blocks = [tidy.iloc[:3], tidy.iloc[3:6], tidy.iloc[6:]]
+    streamed = analyze_stream(iter(blocks), mapping)
+
+    pd.testing.assert_frame_equal(streamed, analyze(tidy, mapping))
+
+
+def test_analyze_stream_small_batches_and_reductions(monkeypatch):
+    import reporter_assay_analyzer.analysis as analysis
+
+    # every plate+timepoint in its own batch, partials reduced every 2 batches
+    monkeypatch.setattr(analysis, "_STREAM_BATCH_ROWS", 1)
+    monkeypatch.setattr(analysis, "_STREAM_MAX_PARTIALS", 2)
+
+    wells = ["A1", "B1", "A2", "B2", "A6", "B6"]
+    tidy = pd.DataFrame({
+        "plate": [str(p) for p in range(3) for _ in range(12)],
+        "time_h": [t for _ in range(3) for t in (0, 1) for _ in range(6)],
+        "well": wells * 6,
+        "value": [float(v) for v in range(10, 46)],
+    })
+    mapping = pd.DataFrame({
+        "well": wells,
+        "sample": ["siNT", "siNT", "siFAM", "siFAM", "blank", "blank"],
+        "condition": ["0mM"] * 4 + ["all"] * 2,
+        "well_type": ["sample"] * 4 + ["blank"] * 2,
+    })
+
+    blocks = [tidy.iloc[i : i + 6] for i in range(0, len(tidy), 6)]
+    streamed = analysis.analyze_stream(iter(blocks), mapping)
+
+    pd.testing.assert_frame_equal(streamed, analyze(tidy, mapping))
+
+
+def test_analyze_ratio_mode_subtracts_blank_per_readout():
+    tidy = pd.DataFrame({
+        "time_h": [0] * 8,
+        "well": ["A1", "A2", "A6", "B6"] * 2,
+        "readout": ["Lum"] * 4 + ["Fluc"] * 4,
+        "value": [110, 410, 10, 10,  55, 105, 5, 5],
+    })
+    mapping = pd.DataFrame({
+        "well": ["A1", "A2", "A6", "B6"],
+        "sample": ["siNT", "siFAM", "blank", "blank"],
+        "condition": ["0mM", "0mM", "all", "all"],
+        "well_type": ["sample", "sample", "blank", "blank"],
+    })
+
+    out = analyze(tidy, mapping, ratio=("Lum", "Fluc"))
+
+    # siNT: 100 / 50 = 2, siFAM: 400 / 100 = 4 -> fold 2
+    fam = out[out["sample"] == "siFAM"].iloc[0]
+    assert fam["0mM average"] == 4.0
+    assert fam["blank"] == 0.0
+    assert fam["0mM (fold to siNT)"] == 2.0
+
+    try:
+        analyze(tidy, mapping)
+        assert False, "Expected ValueError for multi-readout data without ratio"
+    except ValueError:
+        assert True
+
+    # a re-read plate repeats every well+readout; its reads are averaged
+    reread = tidy.assign(value=tidy["value"] * 3)
+    out = analyze(pd.concat([tidy, reread], ignore_index=True), mapping, ratio=("Lum", "Fluc"))
+    fam = out[out["sample"] == "siFAM"].iloc[0]
+    assert fam["0mM average"] == 4.0
+    assert fam["0mM (fold to siNT)"] == 2.0
+
+
+def test_analyze_bootstrap_adds_seeded_fold_ci():
+    tidy = pd.DataFrame({
+        "time_h": [0] * 8,
+        "well":  ["A1", "B1", "C1", "A2", "B2", "C2", "A6", "B6"],
+        "value": [100, 120, 110, 200, 260, 230, 10, 14],
+    })
+    mapping = pd.DataFrame({
+        "well": ["A1", "B1", "C1", "A2", "B2", "C2", "A6", "B6"],
+        "sample": ["siNT"] * 3 + ["siFAM"] * 3 + ["blank"] * 2,
+        "condition": ["0mM"] * 6 + ["all"] * 2,
+        "well_type": ["sample"] * 6 + ["blank"] * 2,
+    })
+
+    out = analyze(tidy, mapping, bootstrap=500, seed=1)
+    again = analyze(tidy, mapping, bootstrap=500, seed=1)
+
+    pd.testing.assert_frame_equal(out, again)
+    nt = out[out["sample"] == "siNT"].iloc[0]
+    assert nt["0mM (fold to siNT) CI low"] == nt["0mM (fold to siNT) CI high"] == 1.0
+    fam = out[out["sample"] == "siFAM"].iloc[0]
+    assert fam["0mM (fold to siNT) CI low"] < fam["0mM (fold to siNT)"] < fam["0mM (fold to siNT) CI high"]
+
+
+def test_analyze_bootstrap_chunks_match_unchunked(monkeypatch):
+    import numpy as np
+    import reporter_assay_analyzer.analysis as analysis
+
+    # siFAM (only at 2mM) sorts before siNT, so a chunk's first group is not
+    # its first control key
+    wells = ["A1", "B1", "C1", "A2", "B2", "C2", "A3", "B3", "C3", "A6", "B6"]
+    mapping = pd.DataFrame({
+        "well": wells,
+        "sample": ["siNT"] * 3 + ["siNT"] * 3 + ["siFAM"] * 3 + ["blank"] * 2,
+        "condition": ["0mM"] * 3 + ["2mM"] * 6 + ["all"] * 2,
+        "well_type": ["sample"] * 9 + ["blank"] * 2,
+    })
+    rng = np.random.default_rng(0)
+    tidy = pd.concat([
+        pd.DataFrame({"plate": str(p), "time_h": t, "well": wells, "value": rng.normal(200, 30, 11)})
+        for p in range(3) for t in [0, 2]
+    ], ignore_index=True)
+
+    out = analyze(tidy, mapping, bootstrap=200, seed=3)
+    monkeypatch.setattr(analysis, "_BOOT_BATCH_CELLS", 1)  # one plate+timepoint per chunk
+    chunked = analyze(tidy, mapping, bootstrap=200, seed=3)
+
+    pd.testing.assert_frame_equal(out, chunked)
+    nt = chunked[chunked["sample"] == "siNT"]
+    for col in ["0mM (fold to siNT) CI low", "2mM (fold to siNT) CI high"]:
+        assert (nt[col] == 1.0).all()
+
+
+def test_analyze_stream_ratio_with_missing_normalizer_block_matches_analyze(monkeypatch):
+    import reporter_assay_analyzer.analysis as analysis
+
+    monkeypatch.setattr(analysis, "_STREAM_BATCH_ROWS", 1)  # one batch per timepoint
+    wells = ["A1", "A2", "A6", "B6"]
+    tidy = pd.DataFrame({
+        "time_h": [0] * 8 + [1] * 4,
+        "well": wells * 3,
+        "readout": ["Lum"] * 4 + ["Fluc"] * 4 + ["Lum"] * 4,  # 1h lacks Fluc
+        "value": [110, 410, 10, 10,  55, 105, 5, 5,  120, 420, 20, 20],
+    })
+    mapping = pd.DataFrame({
+        "well": wells,
+        "sample": ["siNT", "siFAM", "blank", "blank"],
+        "condition": ["0mM", "0mM", "all", "all"],
+        "well_type": ["sample", "sample", "blank", "blank"],
+    })
+
+    blocks = [tidy.iloc[i : i + 4] for i in range(0, len(tidy), 4)]
+    streamed = analyze_stream(iter(blocks), mapping, ratio=("Lum", "Fluc"))
+    out = analyze(tidy, mapping, ratio=("Lum", "Fluc"))
+
+    pd.testing.assert_frame_equal(streamed, out)
+    assert out.loc[out["time_h"] == 1, "0mM (fold to siNT)"].isna().all()
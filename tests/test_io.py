@@ -1,6 +1,18 @@
+import json
+
 import pandas as pd
 
-from reporter_assay_analyzer.io import parse_timepoint_hours, _find_plate_block
+from reporter_assay_analyzer import io
+
+from reporter_assay_analyzer.io import (
+    parse_plate_id,
+    parse_timepoint_hours,
+    locate_plate_block,
+    locate_plate_blocks,
+    read_plate_matrices_xlsx,
+    template_fingerprint,
+    _find_plate_block,
+)
 
 
 def test_parse_timepoint_hours():
@@ -46,3 +58,88 @@ def test_find_plate_block_invalid_small_plate():
     except ValueError:
         assert True
 
+
+
+def test_parse_plate_id():
+    assert parse_plate_id("plate3 2h post transfection.xlsx") == "3"
+    assert parse_plate_id("Plate B - 2h post transfection") == "B"
+    assert parse_plate_id("2h post transfection.xlsx") is None
+    assert parse_plate_id("plate_3_2h post transfection.xlsx") == "3"
+    assert parse_plate_id("plate reader export 2h.xlsx") is None
+    assert parse_plate_id("2h post transfection (plate_map v2).xlsx") is None
+
+
+def test_locate_plate_block_caches_and_reverifies(tmp_path):
+    header = [None] + list(range(1, 13))
+    rows = [["Software Version", "3.10"], header]
+    for i, r in enumerate("ABCDEFGH", start=1):
+        rows.append([r] + [i * 10 + j for j in range(1, 13)])
+    df = pd.DataFrame(rows)
+    cache = tmp_path / "blocks.json"
+
+    assert locate_plate_block(df, cache) == (1, 1)
+    key = template_fingerprint(df)
+    assert json.loads(cache.read_text()) == {key: [[[1, 1]]]}
+
+    # a stale cached layout fails verification -> full scan, new layout first
+    cache.write_text(json.dumps({key: [[[0, 1]]]}))
+    assert locate_plate_block(df, cache) == (1, 1)
+    assert json.loads(cache.read_text())[key][0] == [[1, 1]]
+
+
+def test_locate_plate_blocks_does_not_drop_extra_readouts(tmp_path):
+    # single- and dual-readout sheets with the same template fingerprint
+    rows = [["Software Version", "3.10"]]
+    for name in ["Lum", "Fluc"]:
+        rows.append([None, None] + list(range(1, 13)))
+        for i, r in enumerate("ABCDEFGH", start=1):
+            rows.append([None, r] + [i * 10 + j for j in range(1, 13)] + [name])
+    dual = pd.DataFrame(rows)
+    single = dual.copy()
+    single.iloc[10:, 1:] = None
+    assert template_fingerprint(single) == template_fingerprint(dual)
+    cache = tmp_path / "blocks.json"
+
+    assert locate_plate_blocks(single, cache) == [(1, 2)]
+    assert locate_plate_blocks(dual, cache) == [(1, 2), (10, 2)]
+    # both layouts stay cached, so alternating files keep hitting the cache
+    assert locate_plate_blocks(single, cache) == [(1, 2)]
+    assert locate_plate_blocks(dual, cache) == [(1, 2), (10, 2)]
+    assert len(json.loads(cache.read_text())[template_fingerprint(dual)]) == 2
+
+
+def test_locate_plate_block_stops_at_first_block_on_cache_miss(tmp_path, monkeypatch):
+    rows = [["Software Version", "3.10"]]
+    for name in ["Lum", "Fluc"]:
+        rows.append([None, None] + list(range(1, 13)))
+        for i, r in enumerate("ABCDEFGH", start=1):
+            rows.append([None, r] + [i * 10 + j for j in range(1, 13)] + [name])
+    dual = pd.DataFrame(rows)
+    cache = tmp_path / "blocks.json"
+
+    def full_scan(df):
+        raise AssertionError("single-block lookup scanned the whole sheet")
+
+    monkeypatch.setattr(io, "_find_plate_blocks", full_scan)
+    assert locate_plate_block(dual, cache) == (1, 2)
+    monkeypatch.undo()
+
+    # the one-block layout cached by that lookup is not reused for both readouts
+    assert locate_plate_blocks(dual, cache) == [(1, 2), (10, 2)]
+
+
+def test_read_plate_matrices_xlsx_reads_every_readout(tmp_path):
+    rows = []
+    for name, scale in [("Lum", 1), ("Fluc", 100)]:
+        rows.append([None] + list(range(1, 13)))
+        for i, r in enumerate("ABCDEFGH", start=1):
+            rows.append([r] + [scale * (i * 10 + j) for j in range(1, 13)] + [name])
+        rows.append([])
+    path = tmp_path / "dual 0h.xlsx"
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+
+    plates = read_plate_matrices_xlsx(path)
+
+    assert list(plates) == ["Lum", "Fluc"]
+    assert plates["Lum"].loc["A", 1] == 11
+    assert plates["Fluc"].loc["H", 12] == 9200
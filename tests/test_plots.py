@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import matplotlib
+import matplotlib.image
+import numpy as np
+import pandas as pd
+
+matplotlib.use("Agg")
+
+from reporter_assay_analyzer.plots import plot_plate_heatmaps
+
+
+def test_plot_plate_heatmaps_writes_one_page_per_grid(tmp_path: Path):
+    wells = [f"{r}{c}" for r in "ABCDEFGH" for c in range(1, 13)]
+    blocks = [
+        pd.DataFrame({"time_h": t, "well": wells, "value": [float(t + 1)] * 96})
+        for t in range(5)
+    ]
+    mapping = pd.DataFrame({
+        "well": wells,
+        "well_type": ["blank" if w.endswith("6") else "sample" for w in wells],
+    })
+
+    pages = plot_plate_heatmaps(iter(blocks), mapping, tmp_path, grid=(1, 2))
+
+    assert [p.name for p in pages] == ["qc_page_001.png", "qc_page_002.png", "qc_page_003.png"]
+    assert all(p.exists() for p in pages)
+
+
+def test_plot_plate_heatmaps_resets_scale_on_page_without_positive_values(tmp_path: Path):
+    wells = [f"{r}{c}" for r in "ABCDEFGH" for c in range(1, 13)]
+    mapping = pd.DataFrame({"well": wells, "well_type": ["sample"] * 96})
+    zeros = pd.DataFrame({"time_h": 1, "well": wells, "value": [0.0] * 96})
+
+    pages = []
+    for i, first_value in enumerate([5.0, 5000.0]):
+        first = pd.DataFrame({"time_h": 0, "well": wells, "value": [first_value] * 96})
+        out = plot_plate_heatmaps([first, zeros], mapping, tmp_path / str(i), grid=(1, 1))
+        pages.append(matplotlib.image.imread(out[1]))
+
+    # the all-zero page must not depend on the page before it
+    assert np.array_equal(pages[0], pages[1])
+
+
+def test_plot_plate_heatmaps_accepts_lowercase_and_rejects_invalid_wells(tmp_path: Path):
+    wells = [f"{r}{c}" for r in "ABCDEFGH" for c in range(1, 13)]
+    block = pd.DataFrame({"time_h": 0, "well": wells, "value": [1.0] * 96})
+    mapping = pd.DataFrame({"well": [w.lower() for w in wells], "well_type": ["sample"] * 96})
+
+    assert len(plot_plate_heatmaps([block], mapping, tmp_path, grid=(1, 1))) == 1
+
+    mapping.loc[0, "well"] = "I1"
+    try:
+        plot_plate_heatmaps([block], mapping, tmp_path, grid=(1, 1))
+        assert False, "Expected ValueError for a well outside A1..H12"
+    except ValueError as e:
+        assert "['I1']" in str(e)
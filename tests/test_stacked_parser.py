@@ -1,7 +1,7 @@
 from pathlib import Path
 from openpyxl import Workbook
 
-from reporter_assay_analyzer.stacked_parser import parse_stacked_combined_raw_xlsx
+from reporter_assay_analyzer.stacked_parser import iter_stacked_blocks, parse_stacked_combined_raw_xlsx
 
 
 def _write_fake_stacked_combined(path: Path) -> None:
@@ -38,3 +38,13 @@ def test_parse_stacked_combined_raw_xlsx(tmp_path: Path):
     assert tidy["time_h"].unique().tolist() == [0]
     assert "A1" in tidy["well"].values
     assert "H12" in tidy["well"].values
+
+
+def test_iter_stacked_blocks_yields_one_block_per_plate(tmp_path: Path):
+    p = tmp_path / "combined_raw.xlsx"
+    _write_fake_stacked_combined(p)
+
+    blocks = list(iter_stacked_blocks(p))
+    assert len(blocks) == 1
+    assert len(blocks[0]) == 96
+    assert blocks[0]["value"].tolist()[:12] == [float(c) for c in range(1, 13)]